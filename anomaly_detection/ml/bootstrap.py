@@ -46,17 +46,24 @@ def bootstrap_fit(scorer: "RiskScorer") -> None:
         merchant_risk = rng.beta(2.0, 5.0, size=n_samples)
         user_txn_rate = rng.gamma(shape=2.0, scale=1.2, size=n_samples)
 
-        data = np.column_stack((amount, hour, is_foreign, merchant_risk, user_txn_rate))
+        # Inject ~5% fraud-like rows. One uniform draw per column is affinely
+        # mapped onto each fraud range, so the subset costs a single RNG pass
+        # instead of a without-replacement choice plus per-column draws.
+        fraud = rng.random(n_samples) < 0.05
+        u = rng.random((n_samples, 4))
 
-        n_fraud = max(1, int(n_samples * 0.05))
-        fraud_indices = rng.choice(n_samples, size=n_fraud, replace=False)
-        data[fraud_indices, 0] = rng.uniform(5000.0, 20000.0, size=n_fraud)
-        data[fraud_indices, 1] = rng.integers(0, 6, size=n_fraud)
-        data[fraud_indices, 2] = 1.0
-        data[fraud_indices, 3] = rng.uniform(0.85, 1.0, size=n_fraud)
-        data[fraud_indices, 4] = rng.uniform(8.0, 20.0, size=n_fraud)
+        # Fill a preallocated C-contiguous matrix column by column; this avoids
+        # the interleaving copy of column_stack and matches sklearn's row-major
+        # access pattern. float32 is the dtype RiskScorer.fit trains on, so
+        # the matrix is handed over without another conversion copy.
+        data = np.empty((n_samples, 5), dtype=np.float32, order="C")
+        data[:, 0] = np.where(fraud, 5000.0 + u[:, 0] * 15000.0, amount)
+        data[:, 1] = np.where(fraud, np.floor(u[:, 1] * 6.0), hour)
+        data[:, 2] = np.maximum(is_foreign, fraud)
+        data[:, 3] = np.where(fraud, 0.85 + u[:, 2] * 0.15, merchant_risk)
+        data[:, 4] = np.where(fraud, 8.0 + u[:, 3] * 12.0, user_txn_rate)
 
-        scorer.fit(data.astype(float))
+        scorer.fit(data)
         logger.info(
             "Bootstrap training complete on %d synthetic transactions.",
             n_samples,
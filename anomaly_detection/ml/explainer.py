@@ -5,6 +5,7 @@ Human-readable explanation helpers for the Guardian anomaly detection system.
 from __future__ import annotations
 
 import logging
+from math import tanh
 from typing import Dict, List, Mapping
 
 import numpy as np
@@ -20,6 +21,24 @@ DEFAULT_FEATURES: Mapping[str, float] = {
     "user_txn_rate": 0.0,
 }
 
+_FEATURE_NAMES = tuple(DEFAULT_FEATURES)
+
+# Per-column formatting of reason values and notes, matching _compute_contributions.
+_REASON_VALUES = (
+    float,
+    int,
+    int,
+    lambda value: round(value, 3),
+    lambda value: round(value, 3),
+)
+_REASON_NOTES = (
+    None,
+    "night-time activity",
+    "foreign transaction",
+    "historically risky merchant",
+    None,
+)
+
 
 def default_reasons(features: Mapping[str, object], score: float) -> List[Dict[str, object]]:
     """
@@ -51,6 +70,60 @@ def default_reasons(features: Mapping[str, object], score: float) -> List[Dict[s
     return reasons
 
 
+def default_reasons_batch(
+    matrix: np.ndarray, scores: np.ndarray
+) -> List[List[Dict[str, object]]]:
+    """
+    Vectorized `default_reasons` for a whole batch of sanitized features.
+
+    Args:
+        matrix: Sanitized feature matrix of shape (n_samples, 5) with columns in
+            `DEFAULT_FEATURES` order.
+        scores: Normalized risk scores in [0, 1], one per row.
+
+    Returns:
+        One reason list per row, identical to calling `default_reasons` on each.
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    scores = np.asarray(scores, dtype=float)
+    amount, hour, is_foreign, merchant_risk, txn_rate = matrix.T
+
+    foreign_mask = is_foreign >= 1.0
+    night_mask = (hour >= 0) & (hour <= 5)
+    risky_merchant_mask = merchant_risk > 0.7
+
+    # Columns follow DEFAULT_FEATURES, which is alphabetical, so a stable sort
+    # on descending weight reproduces the (-weight, feature) ordering exactly.
+    weights = np.empty_like(matrix)
+    weights[:, 0] = np.maximum(np.tanh(amount / 600.0), 0.0)
+    weights[:, 1] = np.where(night_mask, 0.3, np.maximum(0.05 * scores, 0.01))
+    weights[:, 2] = np.where(foreign_mask, 1.0, 0.1 * scores)
+    weights[:, 3] = np.where(
+        risky_merchant_mask, 0.5 + 0.5 * merchant_risk, merchant_risk * 0.4
+    )
+    weights[:, 4] = np.maximum(np.tanh(txn_rate / 4.0), 0.0)
+    top = np.argsort(-weights, axis=1, kind="stable")[:, :3]
+
+    notes = np.zeros(matrix.shape, dtype=bool)
+    notes[:, 1] = night_mask
+    notes[:, 2] = foreign_mask
+    notes[:, 3] = risky_merchant_mask
+
+    batch: List[List[Dict[str, object]]] = []
+    for row, row_notes, row_top in zip(matrix.tolist(), notes.tolist(), top.tolist()):
+        reasons: List[Dict[str, object]] = []
+        for idx in row_top:
+            reason: Dict[str, object] = {
+                "feature": _FEATURE_NAMES[idx],
+                "value": _REASON_VALUES[idx](row[idx]),
+            }
+            if row_notes[idx]:
+                reason["note"] = _REASON_NOTES[idx]
+            reasons.append(reason)
+        batch.append(reasons)
+    return batch
+
+
 def _sanitize_features(features: Mapping[str, object]) -> Dict[str, float]:
     """
     Ensure all expected features are present and coerced to floats.
@@ -65,11 +138,11 @@ def _sanitize_features(features: Mapping[str, object]) -> Dict[str, float]:
             numeric = float(default_value)
 
         if key == "hour":
-            numeric = float(np.clip(round(numeric), 0, 23))
+            numeric = float(max(0, min(23, round(numeric))))
         elif key == "is_foreign":
             numeric = 1.0 if numeric >= 0.5 else 0.0
         elif key == "merchant_risk":
-            numeric = float(np.clip(numeric, 0.0, 1.0))
+            numeric = min(max(numeric, 0.0), 1.0)
         elif key in {"amount", "user_txn_rate"}:
             numeric = float(max(numeric, 0.0))
 
@@ -89,7 +162,7 @@ def _compute_contributions(features: Mapping[str, float], score: float) -> List[
     merchant_risk = features["merchant_risk"]
     txn_rate = features["user_txn_rate"]
 
-    amount_weight = float(np.tanh(amount / 600.0))
+    amount_weight = tanh(amount / 600.0)
     contributions.append({
         "feature": "amount",
         "value": amount,
@@ -126,7 +199,7 @@ def _compute_contributions(features: Mapping[str, float], score: float) -> List[
         merchant_weight = 0.5 + 0.5 * merchant_risk
         note = "historically risky merchant"
     else:
-        merchant_weight = float(merchant_risk * 0.4)
+        merchant_weight = merchant_risk * 0.4
         note = None
     contributions.append({
         "feature": "merchant_risk",
@@ -135,7 +208,7 @@ def _compute_contributions(features: Mapping[str, float], score: float) -> List[
         "note": note,
     })
 
-    txn_rate_weight = float(np.tanh(txn_rate / 4.0))
+    txn_rate_weight = tanh(txn_rate / 4.0)
     contributions.append({
         "feature": "user_txn_rate",
         "value": round(txn_rate, 3),
@@ -0,0 +1,232 @@
+"""
+Packed Isolation Forest inference for the Guardian anomaly detection system.
+
+After the sklearn `IsolationForest` is fitted, its trees are copied into flat
+struct-of-arrays buffers and traversed by a Numba-compiled kernel. Results match
+`IsolationForest.decision_function`; callers fall back to sklearn when Numba is
+not installed.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Optional
+
+import numpy as np
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.ensemble import IsolationForest
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - numba is an optional accelerator.
+    njit = None
+
+logger = logging.getLogger(__name__)
+
+NUMBA_AVAILABLE = njit is not None
+
+
+def average_path_length(n_samples: np.ndarray) -> np.ndarray:
+    """
+    Average path length of an unsuccessful BST search over `n_samples` items.
+
+    Mirrors sklearn's private `_average_path_length` so packed trees can bake
+    the leaf correction term in at pack time.
+    """
+    n_samples = np.asarray(n_samples, dtype=float)
+    result = np.zeros_like(n_samples)
+    result[n_samples == 2] = 1.0
+    mask = n_samples > 2
+    result[mask] = (
+        2.0 * (np.log(n_samples[mask] - 1.0) + np.euler_gamma)
+        - 2.0 * (n_samples[mask] - 1.0) / n_samples[mask]
+    )
+    return result
+
+
+if NUMBA_AVAILABLE:
+
+    # Serial and GIL-free: the kernel runs on Django request threads, where
+    # Numba's parallel threading layers are not reliably thread- or fork-safe.
+    # Concurrency comes from the calling threads instead.
+    @njit(nogil=True, cache=True)
+    def _forest_path_lengths(
+        X, roots, feature, threshold, missing_left, left, right, leaf_adjust
+    ):
+        """
+        Sum the isolation path length of every row across all packed trees.
+
+        NaN fails every `<=` comparison, so it is routed by the node's
+        `missing_left` flag, as sklearn does.
+        """
+        n_samples = X.shape[0]
+        n_trees = roots.shape[0]
+        totals = np.zeros(n_samples)
+        for i in range(n_samples):
+            total = 0.0
+            for t in range(n_trees):
+                node = roots[t]
+                depth = 0
+                while left[node] != -1:
+                    value = X[i, feature[node]]
+                    if value <= threshold[node] or (
+                        np.isnan(value) and missing_left[node]
+                    ):
+                        node = left[node]
+                    else:
+                        node = right[node]
+                    depth += 1
+                total += depth + leaf_adjust[node]
+            totals[i] = total
+        return totals
+
+else:
+    _forest_path_lengths = None
+
+
+class PackedForest:
+    """
+    Struct-of-arrays copy of a fitted IsolationForest.
+
+    All trees are concatenated into flat node arrays; `roots` holds each
+    tree's first node and child indices are absolute, so traversal is plain
+    integer indexing with no per-tree padding.
+    """
+
+    def __init__(
+        self,
+        roots: np.ndarray,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        missing_left: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        leaf_adjust: np.ndarray,
+        normalizer: float,
+        offset: float,
+    ) -> None:
+        self.roots = roots
+        self.feature = feature
+        self.threshold = threshold
+        self.missing_left = missing_left
+        self.left = left
+        self.right = right
+        self.leaf_adjust = leaf_adjust
+        self.normalizer = normalizer
+        self.offset = offset
+
+    @classmethod
+    def from_isolation_forest(cls, model: IsolationForest) -> Optional["PackedForest"]:
+        """
+        Pack a fitted forest, or return None when packing is not possible.
+        """
+        if not NUMBA_AVAILABLE:
+            logger.info("Numba not installed; using sklearn forest traversal.")
+            return None
+
+        if model.n_features_in_ != getattr(model, "_max_features", model.n_features_in_):
+            # Feature subsampling would require per-tree column maps.
+            logger.info("IsolationForest uses feature subsampling; skipping packing.")
+            return None
+
+        trees = [estimator.tree_ for estimator in model.estimators_]
+        n_trees = len(trees)
+        counts = np.array([tree.node_count for tree in trees], dtype=np.int64)
+        starts = np.zeros(n_trees, dtype=np.int64)
+        np.cumsum(counts[:-1], out=starts[1:])
+        if counts.sum() > np.iinfo(np.int32).max:
+            logger.info("IsolationForest too large for int32 node indices; skipping packing.")
+            return None
+
+        def _absolute(children: np.ndarray, start: int) -> np.ndarray:
+            return np.where(children == -1, -1, children + start)
+
+        # Leaves carry a negative feature index in sklearn; clamp so the
+        # kernel never needs a bounds check.
+        feature = np.concatenate([np.maximum(tree.feature, 0) for tree in trees])
+        left = np.concatenate(
+            [_absolute(tree.children_left, start) for tree, start in zip(trees, starts)]
+        )
+        right = np.concatenate(
+            [_absolute(tree.children_right, start) for tree, start in zip(trees, starts)]
+        )
+        # sklearn < 1.3 has no missing-value routing and sends NaN right.
+        missing_left = np.concatenate(
+            [
+                np.asarray(
+                    getattr(tree, "missing_go_to_left", np.zeros(tree.node_count)),
+                    dtype=np.bool_,
+                )
+                for tree in trees
+            ]
+        )
+        leaf_adjust = np.concatenate(
+            [average_path_length(tree.n_node_samples) for tree in trees]
+        )
+
+        # Inputs are float32, so rounding each float64 threshold down to the
+        # nearest float32 keeps every `x <= threshold` comparison unchanged.
+        threshold64 = np.concatenate([tree.threshold for tree in trees])
+        threshold = threshold64.astype(np.float32)
+        rounded_up = threshold > threshold64
+        threshold[rounded_up] = np.nextafter(threshold[rounded_up], np.float32(-np.inf))
+
+        normalizer = n_trees * float(average_path_length(np.array([model.max_samples_]))[0])
+        return cls(
+            roots=starts.astype(np.int32),
+            feature=feature.astype(np.int32),
+            threshold=threshold,
+            missing_left=missing_left,
+            left=left.astype(np.int32),
+            right=right.astype(np.int32),
+            leaf_adjust=leaf_adjust,
+            normalizer=normalizer,
+            offset=float(model.offset_),
+        )
+
+    def _path_lengths(self, X: np.ndarray) -> np.ndarray:
+        """
+        Total path length per row of a C-contiguous float32 matrix.
+        """
+        return _forest_path_lengths(
+            X,
+            self.roots,
+            self.feature,
+            self.threshold,
+            self.missing_left,
+            self.left,
+            self.right,
+            self.leaf_adjust,
+        )
+
+    def decision_function(self, X: np.ndarray) -> np.ndarray:
+        """
+        Equivalent of `IsolationForest.decision_function` on the packed trees.
+        """
+        # sklearn validates inputs to float32 before traversal; do the same so
+        # split comparisons land on identical sides.
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        # The kernel releases the GIL, so row chunks can run on joblib threads
+        # when the caller opens a parallel_config context. `None` resolves to
+        # that context's n_jobs and to 1 outside it; the bare default of -1
+        # would fan out over every core for any batch.
+        n_jobs = min(effective_n_jobs(None), X.shape[0])
+        if n_jobs > 1:
+            chunks = np.array_split(X, n_jobs)
+            totals = np.concatenate(
+                Parallel(n_jobs=n_jobs, prefer="threads")(
+                    delayed(self._path_lengths)(chunk) for chunk in chunks
+                )
+            )
+        else:
+            totals = self._path_lengths(X)
+        # `totals` is a fresh array, so the score transform runs in place.
+        if self.normalizer > 0:
+            np.divide(totals, -self.normalizer, out=totals)
+            np.exp2(totals, out=totals)
+        else:
+            # sklearn treats a zero normalizer as a depth ratio of 1.
+            totals.fill(0.5)
+        np.negative(totals, out=totals)
+        totals -= self.offset
+        return totals
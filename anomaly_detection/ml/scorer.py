@@ -8,15 +8,72 @@ application to score transaction batches deterministically and efficiently.
 from __future__ import annotations
 
 import logging
-from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+import os
+import threading
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
 import numpy as np
+import sklearn
+from joblib import Memory, parallel_config
 from sklearn.ensemble import IsolationForest
 
-from .explainer import default_reasons
+from .bootstrap import bootstrap_fit
+from .explainer import default_reasons_batch
+from .forest import PackedForest
 
 logger = logging.getLogger(__name__)
 
+# Fitted forests are cached on disk keyed on the training data,
+# hyperparameters and scikit-learn version, so worker restarts load the model
+# instead of refitting.
+_MODEL_CACHE = Memory(
+    location=os.getenv("GUARDIAN_MODEL_CACHE", ".model_cache"),
+    mmap_mode="r",
+    verbose=0,
+)
+
+# Most recently used forests kept on disk; older entries are evicted after
+# each fit.
+_MODEL_CACHE_ITEMS = 8
+
+
+@_MODEL_CACHE.cache
+def _fit_forest(
+    scaled: np.ndarray,
+    n_estimators: int,
+    max_samples: int,
+    contamination: float,
+    random_state: int,
+    sklearn_version: str,
+) -> IsolationForest:
+    """
+    Fit an IsolationForest on scaled features, memoized by `_MODEL_CACHE`.
+
+    `sklearn_version` is unused by the fit itself. It is part of the cache
+    key, so an upgrade refits instead of unpickling a forest written by an
+    older scikit-learn.
+    """
+    model = IsolationForest(
+        n_estimators=n_estimators,
+        max_samples=max_samples,
+        contamination=contamination,
+        random_state=random_state,
+        n_jobs=1,
+    )
+    return model.fit(scaled)
+
+
+def _trim_model_cache() -> None:
+    """
+    Evict least recently used forests beyond `_MODEL_CACHE_ITEMS`.
+    """
+    try:
+        _MODEL_CACHE.reduce_size(items_limit=_MODEL_CACHE_ITEMS)
+    except OSError as exc:
+        # Another worker may be evicting the same entries concurrently.
+        logger.warning("Failed to trim model cache: %s", exc)
+
 
 class RiskScorer:
     """
@@ -25,6 +82,10 @@ class RiskScorer:
     The scorer performs min-max scaling on the five expected features, trains an
     IsolationForest, and maps raw anomaly scores onto [0, 1]. Inference is
     deterministic and resilient to malformed input.
+
+    Scaled features are held in float32. Tree splits are plain threshold
+    comparisons and sklearn casts inputs to float32 internally anyway, so the
+    extra float64 precision only cost memory bandwidth.
     """
 
     FEATURES: Sequence[str] = (
@@ -43,27 +104,50 @@ class RiskScorer:
         "user_txn_rate": 0.0,
     }
 
+    # DEFAULT_FEATURES as a row vector, in FEATURES order.
+    _DEFAULT_ROW: np.ndarray = np.array(tuple(DEFAULT_FEATURES.values()), dtype=np.float64)
+
+    # Magnitude bound for coerced features; the forest scales in float32.
+    _FEATURE_BOUND: float = float(np.finfo(np.float32).max)
+
+    # Batches at least this large run forest traversal on a threading backend;
+    # below it, joblib dispatch overhead outweighs the per-thread work.
+    PARALLEL_THRESHOLD: int = 2048
+
+    # Distinct feature vectors remembered by `score_one` between fits.
+    SCORE_CACHE_SIZE: int = 4096
+
     def __init__(self) -> None:
         self._model: Optional[IsolationForest] = None
-        self.feature_min: np.ndarray = np.zeros(len(self.FEATURES), dtype=float)
-        self.feature_max: np.ndarray = np.ones(len(self.FEATURES), dtype=float)
+        self._packed: Optional[PackedForest] = None
+        self.feature_min: np.ndarray = np.zeros(len(self.FEATURES), dtype=np.float32)
+        self.feature_max: np.ndarray = np.ones(len(self.FEATURES), dtype=np.float32)
+        self._inv_range: np.ndarray = np.ones(len(self.FEATURES), dtype=np.float32)
+        self._degenerate: np.ndarray = np.zeros(len(self.FEATURES), dtype=bool)
         self.score_min: float = 0.0
         self.score_max: float = 1.0
+        self._score_scale: float = 1.0
         self._fitted: bool = False
+        self._fit_lock = threading.Lock()
+        self._score_cached = lru_cache(maxsize=self.SCORE_CACHE_SIZE)(self._score_features)
 
     def fit(self, X: np.ndarray) -> None:
         """
         Fit the internal IsolationForest and scaling parameters.
 
         Args:
-            X: Training array with shape (n_samples, 5).
+            X: Training array with shape (n_samples, 5). The array is converted
+                to C-contiguous float32 once here; sklearn traverses rows in
+                float32, so a Fortran-ordered or float64 input (e.g. from
+                `np.column_stack`) would otherwise be copied again inside the
+                estimator.
         """
         try:
             if X is None:
                 logger.error("Provided training data is None; skipping fit.")
                 return
 
-            X = np.asarray(X, dtype=float)
+            X = np.ascontiguousarray(X, dtype=np.float32)
             if X.ndim != 2 or X.shape[1] != len(self.FEATURES):
                 logger.error(
                     "Training data must have shape (n_samples, %d); received %s",
@@ -74,25 +158,38 @@ class RiskScorer:
 
             self.feature_min = np.min(X, axis=0)
             self.feature_max = np.max(X, axis=0)
-
+            feature_range = self.feature_max - self.feature_min
+            self._degenerate = feature_range <= 0
+            # Stored as a reciprocal so scaling multiplies instead of divides.
+            self._inv_range = (
+                1.0 / np.where(self._degenerate, 1.0, feature_range)
+            ).astype(np.float32)
+
+            # Already C-contiguous float32, so sklearn's validation keeps it
+            # without another copy.
             scaled = self._scale_array(X)
 
-            self._model = IsolationForest(
+            self._model = _fit_forest(
+                scaled,
                 n_estimators=200,
+                max_samples=min(256, X.shape[0]),
                 contamination=0.02,
                 random_state=42,
-                n_jobs=1,
+                sklearn_version=sklearn.__version__,
             )
-            self._model.fit(scaled)
+            _trim_model_cache()
+            self._packed = PackedForest.from_isolation_forest(self._model)
 
-            raw_scores = -self._model.decision_function(scaled)
+            raw_scores = -self._decision_function(scaled)
             self.score_min = float(np.min(raw_scores))
             self.score_max = float(np.max(raw_scores))
             if self.score_max <= self.score_min:
                 # Degenerate case: collapse range to a default span.
                 self.score_max = self.score_min + 1.0
+            self._score_scale = 1.0 / (self.score_max - self.score_min)
 
             self._fitted = True
+            self._score_cached.cache_clear()
             logger.info(
                 "RiskScorer fitted on %d samples with feature ranges recorded.",
                 X.shape[0],
@@ -101,6 +198,31 @@ class RiskScorer:
             logger.exception("Failed to fit RiskScorer: %s", exc)
             self._fitted = False
 
+    def ensure_fitted(
+        self, training_data: Optional[Callable[[], np.ndarray]] = None
+    ) -> None:
+        """
+        Train the scorer on first use, at most once per process.
+
+        Concurrent first requests serialize on a lock and re-check the fitted
+        flag, so only one thread pays for the fit; with the on-disk model
+        cache, later processes load the forest instead of refitting.
+
+        Args:
+            training_data: Optional callable returning a (n_samples, 5) array.
+                It is only invoked if a fit is needed. Defaults to the
+                synthetic bootstrap data.
+        """
+        if self._fitted:
+            return
+        with self._fit_lock:
+            if self._fitted:
+                return
+            if training_data is None:
+                bootstrap_fit(self)
+            else:
+                self.fit(training_data())
+
     def score_batch(
         self, transactions: Optional[Iterable[Mapping[str, object]]]
     ) -> List[Dict[str, object]]:
@@ -118,136 +240,211 @@ class RiskScorer:
             logger.warning("score_batch received None; returning empty result.")
             return results
 
-        for index, txn in enumerate(transactions):
-            txn_id = self._extract_id(txn, index)
-            features_dict = self._prepare_features_dict(txn)
-            feature_vector = self._dict_to_vector(features_dict)
-
-            if self._fitted and self._model is not None:
-                scaled_vector = self._scale_row(feature_vector)
-                try:
-                    raw_score = float(-self._model.decision_function([scaled_vector])[0])
-                except Exception as exc:  # noqa: BLE001 - guard upstream consumers.
-                    logger.exception(
-                        "Scoring failure for transaction %s: %s", txn_id, exc
-                    )
-                    raw_score = 0.0
-                normalized_score = self._normalize_score(raw_score)
-            else:
-                normalized_score = 0.0
-                logger.warning(
-                    "RiskScorer is not fitted. Returning default score for %s.",
-                    txn_id,
-                )
+        txns = list(transactions)
+        if not txns:
+            return results
 
-            reasons = default_reasons(features_dict, normalized_score)
+        ids = [self._extract_id(txn, index) for index, txn in enumerate(txns)]
+        # Well-formed batches are plain dicts throughout; check that once and
+        # skip the per-row defensive lookups.
+        if all(
+            isinstance(txn, dict) and isinstance(txn.get("features"), dict)
+            for txn in txns
+        ):
+            feature_maps = [txn["features"] for txn in txns]
+        else:
+            feature_maps = [self._extract_features(txn) for txn in txns]
+        # Rows are gathered as plain lists and converted in one call; writing
+        # each value into an ndarray row would cost a numpy dispatch per item.
+        # Kept in float64 so the feature values echoed in reasons stay exact;
+        # _scale_array hands the forest a float32 copy.
+        matrix = np.asarray(
+            [self._feature_values(features) for features in feature_maps],
+            dtype=np.float64,
+        )
+        self._sanitize_matrix(matrix)
+
+        scores = self._score_matrix(matrix)
+
+        reasons_batch = default_reasons_batch(matrix, scores)
+        for txn_id, normalized_score, reasons in zip(ids, scores.tolist(), reasons_batch):
             results.append(
                 {"id": txn_id, "score": normalized_score, "reasons": reasons}
             )
 
         return results
 
-    def _normalize_score(self, raw_score: float) -> float:
+    def score_one(self, txn: Mapping[str, object]) -> Dict[str, object]:
+        """
+        Score a single transaction, memoized on its sanitized feature vector.
+
+        Returns the same dictionary as `score_batch([txn])[0]`. Repeated
+        feature vectors skip the forest traversal; the memo is cleared on fit.
         """
-        Map the raw anomaly score onto [0, 1] using the learned score range.
+        row = np.asarray(
+            [self._feature_values(self._extract_features(txn))], dtype=np.float64
+        )
+        self._sanitize_matrix(row)
+        score, reasons = self._score_cached(tuple(row[0].tolist()))
+        return {
+            "id": self._extract_id(txn, 0),
+            "score": score,
+            # Copies keep callers from mutating the memoized reasons.
+            "reasons": [dict(reason) for reason in reasons],
+        }
+
+    def _score_features(
+        self, features: Tuple[float, ...]
+    ) -> Tuple[float, List[Dict[str, object]]]:
         """
-        adjusted = float(np.clip(raw_score, self.score_min, self.score_max))
-        denom = self.score_max - self.score_min
-        if denom <= 0:
-            return 0.5
-        normalized = (adjusted - self.score_min) / denom
-        return float(np.clip(normalized, 0.0, 1.0))
+        Score one sanitized feature vector; wrapped by the `score_one` memo.
+        """
+        matrix = np.array([features], dtype=np.float64)
+        scores = self._score_matrix(matrix)
+        return float(scores[0]), default_reasons_batch(matrix, scores)[0]
 
-    def _scale_array(self, data: np.ndarray) -> np.ndarray:
+    def _score_matrix(self, matrix: np.ndarray) -> np.ndarray:
         """
-        Apply min-max scaling to a 2D array using stored feature ranges.
+        Compute normalized risk scores for a sanitized (n_samples, 5) matrix.
+
+        The whole batch goes through a single `decision_function` call so the
+        forest traversal runs once in native code rather than once per row.
         """
-        scaled = np.zeros_like(data, dtype=float)
-        for idx, (min_val, max_val) in enumerate(zip(self.feature_min, self.feature_max)):
-            denom = max_val - min_val
-            if denom <= 0:
-                scaled[:, idx] = 0.5
-            else:
-                scaled[:, idx] = np.clip(
-                    (data[:, idx] - min_val) / denom,
-                    0.0,
-                    1.0,
-                )
-        return scaled
+        if not self._fitted or self._model is None:
+            logger.warning(
+                "RiskScorer is not fitted. Returning default scores for %d transactions.",
+                matrix.shape[0],
+            )
+            return np.zeros(matrix.shape[0], dtype=float)
+
+        try:
+            matrix = np.ascontiguousarray(matrix, dtype=np.float64)
+            raw_scores = self._decision_function(self._scale_array(matrix))
+            np.negative(raw_scores, out=raw_scores)
+        except Exception as exc:  # noqa: BLE001 - guard upstream consumers.
+            logger.exception(
+                "Scoring failure for batch of %d transactions: %s",
+                matrix.shape[0],
+                exc,
+            )
+            raw_scores = np.zeros(matrix.shape[0], dtype=float)
+        return self._normalize_scores(raw_scores)
 
-    def _scale_row(self, row: np.ndarray) -> np.ndarray:
+    def _decision_function(self, scaled: np.ndarray) -> np.ndarray:
         """
-        Scale a single feature row while handling degenerate ranges gracefully.
+        Run the fitted forest, preferring the packed Numba kernel when built.
         """
-        scaled = np.zeros_like(row, dtype=float)
-        for idx, value in enumerate(row):
-            min_val = self.feature_min[idx]
-            max_val = self.feature_max[idx]
-            denom = max_val - min_val
-            if denom <= 0:
-                scaled[idx] = 0.5
-            else:
-                scaled[idx] = float(
-                    np.clip((value - min_val) / denom, 0.0, 1.0)
-                )
+        assert scaled.flags["C_CONTIGUOUS"], "feature matrix must be C-ordered"
+        if scaled.shape[0] < self.PARALLEL_THRESHOLD:
+            return self._run_forest(scaled)
+        # sklearn scores trees sequentially unless a joblib context overrides
+        # n_jobs; tree traversal releases the GIL, so threads scale with cores.
+        with parallel_config(backend="threading", n_jobs=-1):
+            return self._run_forest(scaled)
+
+    def _run_forest(self, scaled: np.ndarray) -> np.ndarray:
+        """
+        Dispatch to the packed kernel or the sklearn estimator.
+        """
+        if self._packed is not None:
+            return self._packed.decision_function(scaled)
+        return self._model.decision_function(scaled)
+
+    def _normalize_scores(self, raw_scores: np.ndarray) -> np.ndarray:
+        """
+        Map raw anomaly scores onto [0, 1] using the learned score range.
+
+        The affine map is increasing, so clipping to the learned range first is
+        redundant with the final [0, 1] clip; the reciprocal range is computed
+        once in `fit`, leaving one subtract, multiply and clip per batch.
+        """
+        normalized = np.subtract(raw_scores, self.score_min, dtype=np.float64)
+        normalized *= self._score_scale
+        np.clip(normalized, 0.0, 1.0, out=normalized)
+        return normalized
+
+    def _scale_array(self, data: np.ndarray) -> np.ndarray:
+        """
+        Apply min-max scaling to a 2D array using stored feature ranges.
+
+        Columns with a degenerate (zero-width) range map to 0.5. The result is
+        always float32, whatever the input precision.
+        """
+        scaled = np.subtract(data, self.feature_min, dtype=np.float32)
+        np.multiply(scaled, self._inv_range, out=scaled)
+        np.clip(scaled, 0.0, 1.0, out=scaled)
+        scaled[:, self._degenerate] = 0.5
         return scaled
 
-    def _prepare_features_dict(
-        self, txn: Mapping[str, object]
-    ) -> Dict[str, float]:
+    def _extract_features(self, txn: Mapping[str, object]) -> Mapping[str, object]:
         """
-        Extract and sanitize feature values from a transaction mapping.
+        Return the transaction's feature mapping, or an empty one if missing.
         """
         features = txn.get("features") if isinstance(txn, Mapping) else None
         if not isinstance(features, Mapping):
             logger.debug("Transaction missing 'features'; using defaults.")
-            features = {}
+            return {}
+        return features
 
-        clean: Dict[str, float] = {}
-        for name in self.FEATURES:
-            raw_value = features.get(name, self.DEFAULT_FEATURES[name])
-            clean[name] = self._sanitize_feature(name, raw_value)
-        return clean
+    def _feature_values(self, features: Mapping[str, object]) -> List[float]:
+        """
+        Coerce raw feature values from a feature mapping, in FEATURES order.
 
-    def _sanitize_feature(self, name: str, value: object) -> float:
+        Range clipping happens afterwards for the whole batch in
+        `_sanitize_matrix`.
         """
-        Coerce incoming feature values to floats and clip to valid ranges.
+        defaults = self.DEFAULT_FEATURES
+        try:
+            # Well-formed rows convert in one pass under a single handler.
+            return [float(features.get(name, defaults[name])) for name in self.FEATURES]
+        except (TypeError, ValueError):
+            return [
+                self._coerce_feature(name, features.get(name, defaults[name]))
+                for name in self.FEATURES
+            ]
+
+    def _coerce_feature(self, name: str, value: object) -> float:
+        """
+        Coerce an incoming feature value to float, falling back to the default.
         """
         try:
-            numeric = float(value)
+            return float(value)
         except (TypeError, ValueError):
             logger.debug("Feature %s has invalid value %r; using default.", name, value)
-            numeric = float(self.DEFAULT_FEATURES[name])
-
-        if name == "hour":
-            return float(np.clip(round(numeric), 0, 23))
-        if name == "is_foreign":
-            return float(1.0 if numeric >= 0.5 else 0.0)
-        if name == "merchant_risk":
-            return float(np.clip(numeric, 0.0, 1.0))
-        if name == "amount":
-            return float(max(numeric, 0.0))
-        if name == "user_txn_rate":
-            return float(max(numeric, 0.0))
+            return float(self.DEFAULT_FEATURES[name])
 
-        return float(numeric)
-
-    def _dict_to_vector(self, features: Mapping[str, float]) -> np.ndarray:
+    @classmethod
+    def _sanitize_matrix(cls, matrix: np.ndarray) -> np.ndarray:
         """
-        Convert a feature mapping into a numpy array matching the feature order.
+        Clip a coerced (n_samples, 5) feature matrix to valid ranges in place.
+
+        `float()` accepts "nan" and "inf". NaN carries no value and takes the
+        feature default; infinities and overflowing magnitudes are bounded to
+        the float32 range, so an "inf" amount still scores as the largest
+        possible amount rather than slipping through as a default.
         """
-        return np.array([features.get(name, 0.0) for name in self.FEATURES], dtype=float)
+        np.copyto(matrix, cls._DEFAULT_ROW, where=np.isnan(matrix))
+        np.clip(matrix, -cls._FEATURE_BOUND, cls._FEATURE_BOUND, out=matrix)
+        np.maximum(matrix[:, 0], 0.0, out=matrix[:, 0])
+        matrix[:, 1] = np.clip(np.round(matrix[:, 1]), 0, 23)
+        matrix[:, 2] = matrix[:, 2] >= 0.5
+        np.clip(matrix[:, 3], 0.0, 1.0, out=matrix[:, 3])
+        np.maximum(matrix[:, 4], 0.0, out=matrix[:, 4])
+        return matrix
 
     def _extract_id(self, txn: Mapping[str, object], index: int) -> str:
         """
         Safely derive a transaction identifier from the input mapping.
+
+        Non-string ids such as integers are stringified so callers can match
+        results back to their inputs.
         """
         identifier = None
         if isinstance(txn, Mapping):
             identifier = txn.get("id")
-        if not isinstance(identifier, str) or not identifier:
-            identifier = f"txn_{index}"
-        return identifier
+        if identifier is None or identifier == "":
+            return f"txn_{index}"
+        return str(identifier)
 
 
 SCORER = RiskScorer()
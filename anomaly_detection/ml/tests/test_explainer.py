@@ -0,0 +1,60 @@
+"""
+Equivalence checks between the batched and per-row reason builders.
+"""
+
+import unittest
+
+import numpy as np
+
+from anomaly_detection.ml.explainer import (
+    DEFAULT_FEATURES,
+    default_reasons,
+    default_reasons_batch,
+)
+
+
+class DefaultReasonsBatchTests(unittest.TestCase):
+    def sanitized_rows(self, count):
+        """
+        Random sanitized rows, weighted towards ties and branch boundaries.
+        """
+        rng = np.random.default_rng(5)
+        amount = np.where(
+            rng.random(count) < 0.3,
+            rng.choice([0.0, 600.0, 6000.0], count),
+            rng.lognormal(5.0, 1.5, count),
+        )
+        hour = rng.choice([0.0, 5.0, 6.0, 12.0, 23.0], count)
+        is_foreign = rng.choice([0.0, 1.0], count)
+        merchant_risk = np.where(
+            rng.random(count) < 0.3,
+            rng.choice([0.0, 0.7, 1.0], count),
+            rng.random(count),
+        )
+        # 4.0 ties amount 600.0 (tanh(1) for both); 0.0 ties a zero amount.
+        txn_rate = np.where(
+            rng.random(count) < 0.3,
+            rng.choice([0.0, 4.0, 40.0], count),
+            rng.gamma(2.0, 2.0, count),
+        )
+        scores = np.where(
+            rng.random(count) < 0.2, rng.choice([0.0, 1.0], count), rng.random(count)
+        )
+        matrix = np.column_stack([amount, hour, is_foreign, merchant_risk, txn_rate])
+        return matrix, scores
+
+    def test_matches_default_reasons_row_by_row(self):
+        matrix, scores = self.sanitized_rows(5000)
+        batch = default_reasons_batch(matrix, scores)
+        for row, score, reasons in zip(matrix.tolist(), scores.tolist(), batch):
+            features = dict(zip(DEFAULT_FEATURES, row))
+            self.assertEqual(reasons, default_reasons(features, score), features)
+
+    def test_columns_follow_default_features_order(self):
+        # The batch path breaks weight ties by column index, which only
+        # matches the per-row (-weight, feature) sort while names are sorted.
+        self.assertEqual(list(DEFAULT_FEATURES), sorted(DEFAULT_FEATURES))
+
+
+if __name__ == "__main__":
+    unittest.main()
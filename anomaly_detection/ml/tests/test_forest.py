@@ -0,0 +1,47 @@
+"""
+Equivalence checks between PackedForest and sklearn's IsolationForest.
+"""
+
+import unittest
+
+import numpy as np
+from sklearn.ensemble import IsolationForest
+
+from anomaly_detection.ml.forest import NUMBA_AVAILABLE, PackedForest
+
+
+@unittest.skipUnless(NUMBA_AVAILABLE, "numba is not installed")
+class PackedForestTests(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.train = rng.random((600, 5)).astype(np.float32)
+        self.rows = rng.random((200, 5)).astype(np.float32)
+
+    def assert_matches_sklearn(self, model, X):
+        packed = PackedForest.from_isolation_forest(model)
+        self.assertIsNotNone(packed)
+        # Path lengths are summed in a different order than sklearn's, so
+        # allow for last-bit rounding differences.
+        np.testing.assert_allclose(
+            packed.decision_function(X), model.decision_function(X), rtol=0, atol=1e-12
+        )
+
+    def test_matches_sklearn(self):
+        model = IsolationForest(n_estimators=50, random_state=0).fit(self.train)
+        self.assert_matches_sklearn(model, self.rows)
+
+    def test_matches_sklearn_with_nan_rows(self):
+        model = IsolationForest(n_estimators=50, random_state=0).fit(self.train)
+        X = self.rows.copy()
+        X[::3, 0] = np.nan
+        X[::7, 3] = np.nan
+        X[1, :] = np.nan
+        self.assert_matches_sklearn(model, X)
+
+    def test_matches_sklearn_on_single_row_fit(self):
+        model = IsolationForest(n_estimators=5, random_state=0).fit(self.train[:1])
+        self.assert_matches_sklearn(model, self.rows)
+
+
+if __name__ == "__main__":
+    unittest.main()
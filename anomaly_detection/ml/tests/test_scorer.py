@@ -0,0 +1,77 @@
+"""
+Behavioural checks for RiskScorer.
+"""
+
+import unittest
+from unittest import mock
+
+import numpy as np
+from joblib import Parallel
+
+from anomaly_detection.ml import forest, scorer
+from anomaly_detection.ml.scorer import RiskScorer
+
+
+def _fitted_scorer() -> RiskScorer:
+    """
+    Fit a RiskScorer on random rows without touching the on-disk model cache.
+    """
+    rng = np.random.default_rng(11)
+    data = np.column_stack(
+        [
+            rng.lognormal(5.0, 0.6, 1000),
+            rng.integers(0, 24, 1000),
+            rng.binomial(1, 0.1, 1000),
+            rng.beta(2.0, 5.0, 1000),
+            rng.gamma(2.0, 1.2, 1000),
+        ]
+    )
+    risk_scorer = RiskScorer()
+    with mock.patch.object(scorer, "_fit_forest", scorer._fit_forest.func), \
+            mock.patch.object(scorer, "_trim_model_cache"):
+        risk_scorer.fit(data)
+    assert risk_scorer._fitted
+    return risk_scorer
+
+
+class RiskScorerTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.scorer = _fitted_scorer()
+
+    def batch(self, count):
+        return [
+            {"id": f"t{index}", "features": {"amount": 100.0 + index, "hour": 14}}
+            for index in range(count)
+        ]
+
+    def score(self, features):
+        return self.scorer.score_batch([{"id": "t", "features": features}])[0]
+
+    def test_infinite_amount_scores_like_a_huge_amount(self):
+        huge = self.score({"amount": 1e12})
+        for value in ("inf", float("inf")):
+            result = self.score({"amount": value})
+            self.assertEqual(result["score"], huge["score"])
+            self.assertGreater(result["score"], self.score({"amount": 0.0})["score"])
+            amount = next(r for r in result["reasons"] if r["feature"] == "amount")
+            self.assertTrue(np.isfinite(amount["value"]))
+
+    def test_nan_features_fall_back_to_defaults(self):
+        expected = self.score({})
+        self.assertEqual(self.score({"amount": "nan", "hour": "nan"}), expected)
+        self.assertEqual(self.score({"merchant_risk": float("nan")}), expected)
+
+    @unittest.skipUnless(forest.NUMBA_AVAILABLE, "numba is not installed")
+    def test_small_batches_score_serially_on_multicore_hosts(self):
+        with mock.patch("joblib._parallel_backends.cpu_count", return_value=8), \
+                mock.patch.object(forest, "Parallel", wraps=Parallel) as parallel:
+            self.scorer.score_batch(self.batch(2))
+            parallel.assert_not_called()
+
+            self.scorer.score_batch(self.batch(RiskScorer.PARALLEL_THRESHOLD))
+            parallel.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,34 @@
+import os
+import sys
+
 from django.apps import AppConfig
 
 
+def _is_server_process():
+    """True when this process serves requests rather than running a command"""
+    if 'gunicorn' in os.path.basename(sys.argv[0]):
+        return True
+    if sys.argv[1:2] == ['runserver']:
+        # The autoreloader's parent only watches files; its child serves.
+        return os.environ.get('RUN_MAIN') == 'true' or '--noreload' in sys.argv
+    return False
+
+
 class BackendConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'backend'
 
+    def ready(self):
+        # Opt-in: fit the ML scorer when a server starts instead of on the
+        # first scoring request. Management commands such as migrate and
+        # collectstatic skip it. Under gunicorn this only saves work with
+        # --preload, where workers inherit the master's fitted model;
+        # otherwise each worker fits (or loads from GUARDIAN_MODEL_CACHE)
+        # as it boots.
+        if (
+            os.getenv('GUARDIAN_PRELOAD_MODEL', 'False').lower() == 'true'
+            and _is_server_process()
+        ):
+            from anomaly_detection.ml.scorer import SCORER
+
+            SCORER.ensure_fitted()
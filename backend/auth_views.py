@@ -1,9 +1,33 @@
+from collections import Counter
+
 from django.shortcuts import render, redirect
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
 from django.contrib.auth import login, logout, authenticate
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 
+# Dummy data for the transaction table; built once and shared read-only
+# across requests.
+_DEMO_TRANSACTIONS = (
+    {'id': 1, 'merchant': 'Tesla, Inc.', 'amount': 120.50, 'risk_level': 'Safe', 'risk_score': 0.2, 'ticker': 'TSLA', 'timestamp': '2024-01-15 10:30:00'},
+    {'id': 2, 'merchant': 'Apple Store', 'amount': 55.20, 'risk_level': 'Safe', 'risk_score': 0.1, 'ticker': 'AAPL', 'timestamp': '2024-01-15 11:15:00'},
+    {'id': 3, 'merchant': 'Crypto Exchange', 'amount': 1500.00, 'risk_level': 'Risky', 'risk_score': 0.9, 'ticker': 'CRYPTO', 'timestamp': '2024-01-15 12:00:00'},
+    {'id': 4, 'merchant': 'Starbucks', 'amount': 12.75, 'risk_level': 'Safe', 'risk_score': 0.1, 'ticker': 'SBUX', 'timestamp': '2024-01-15 13:45:00'},
+    {'id': 5, 'merchant': 'Amazon', 'amount': 780.00, 'risk_level': 'Medium', 'risk_score': 0.6, 'ticker': 'AMZN', 'timestamp': '2024-01-15 14:30:00'},
+    {'id': 6, 'merchant': 'Microsoft', 'amount': 250.00, 'risk_level': 'Safe', 'risk_score': 0.2, 'ticker': 'MSFT', 'timestamp': '2024-01-15 15:15:00'},
+    {'id': 7, 'merchant': 'Unknown Merchant', 'amount': 5200.00, 'risk_level': 'Risky', 'risk_score': 0.95, 'ticker': 'UNKNOWN', 'timestamp': '2024-01-15 16:00:00'},
+    {'id': 8, 'merchant': 'Google', 'amount': 30.00, 'risk_level': 'Safe', 'risk_score': 0.1, 'ticker': 'GOOGL', 'timestamp': '2024-01-15 16:45:00'},
+    {'id': 9, 'merchant': 'Meta', 'amount': 950.00, 'risk_level': 'Medium', 'risk_score': 0.7, 'ticker': 'META', 'timestamp': '2024-01-15 17:30:00'},
+    {'id': 10, 'merchant': 'Netflix', 'amount': 85.00, 'risk_level': 'Safe', 'risk_score': 0.3, 'ticker': 'NFLX', 'timestamp': '2024-01-15 18:15:00'},
+)
+
+_DEMO_LEVEL_COUNTS = Counter(t['risk_level'] for t in _DEMO_TRANSACTIONS)
+_DEMO_RISK_COUNTS = {
+    'safe': _DEMO_LEVEL_COUNTS['Safe'],
+    'medium': _DEMO_LEVEL_COUNTS['Medium'],
+    'risky': _DEMO_LEVEL_COUNTS['Risky'],
+}
+
 def signup_view(request):
     if request.method == 'POST':
         form = UserCreationForm(request.POST)
@@ -49,29 +73,9 @@ def logout_view(request):
 
 @login_required
 def dashboard_view(request):
-    # Dummy data for the transaction table
-    transactions = [
-        {'id': 1, 'merchant': 'Tesla, Inc.', 'amount': 120.50, 'risk_level': 'Safe', 'risk_score': 0.2, 'ticker': 'TSLA', 'timestamp': '2024-01-15 10:30:00'},
-        {'id': 2, 'merchant': 'Apple Store', 'amount': 55.20, 'risk_level': 'Safe', 'risk_score': 0.1, 'ticker': 'AAPL', 'timestamp': '2024-01-15 11:15:00'},
-        {'id': 3, 'merchant': 'Crypto Exchange', 'amount': 1500.00, 'risk_level': 'Risky', 'risk_score': 0.9, 'ticker': 'CRYPTO', 'timestamp': '2024-01-15 12:00:00'},
-        {'id': 4, 'merchant': 'Starbucks', 'amount': 12.75, 'risk_level': 'Safe', 'risk_score': 0.1, 'ticker': 'SBUX', 'timestamp': '2024-01-15 13:45:00'},
-        {'id': 5, 'merchant': 'Amazon', 'amount': 780.00, 'risk_level': 'Medium', 'risk_score': 0.6, 'ticker': 'AMZN', 'timestamp': '2024-01-15 14:30:00'},
-        {'id': 6, 'merchant': 'Microsoft', 'amount': 250.00, 'risk_level': 'Safe', 'risk_score': 0.2, 'ticker': 'MSFT', 'timestamp': '2024-01-15 15:15:00'},
-        {'id': 7, 'merchant': 'Unknown Merchant', 'amount': 5200.00, 'risk_level': 'Risky', 'risk_score': 0.95, 'ticker': 'UNKNOWN', 'timestamp': '2024-01-15 16:00:00'},
-        {'id': 8, 'merchant': 'Google', 'amount': 30.00, 'risk_level': 'Safe', 'risk_score': 0.1, 'ticker': 'GOOGL', 'timestamp': '2024-01-15 16:45:00'},
-        {'id': 9, 'merchant': 'Meta', 'amount': 950.00, 'risk_level': 'Medium', 'risk_score': 0.7, 'ticker': 'META', 'timestamp': '2024-01-15 17:30:00'},
-        {'id': 10, 'merchant': 'Netflix', 'amount': 85.00, 'risk_level': 'Safe', 'risk_score': 0.3, 'ticker': 'NFLX', 'timestamp': '2024-01-15 18:15:00'},
-    ]
-
-    risk_counts = {
-        'safe': sum(1 for t in transactions if t['risk_level'] == 'Safe'),
-        'medium': sum(1 for t in transactions if t['risk_level'] == 'Medium'),
-        'risky': sum(1 for t in transactions if t['risk_level'] == 'Risky'),
-    }
-
     context = {
         'username': request.user.username,
-        'transactions': transactions,
-        'risk_counts': risk_counts,
+        'transactions': _DEMO_TRANSACTIONS,
+        'risk_counts': _DEMO_RISK_COUNTS,
     }
     return render(request, 'dashboard.html', context)
\ No newline at end of file
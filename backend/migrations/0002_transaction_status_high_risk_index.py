@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-15 01:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="transaction",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending Review"),
+                    ("allowed", "Allowed"),
+                    ("blocked", "Blocked"),
+                    ("under_investigation", "Under Investigation"),
+                ],
+                default="pending",
+                max_length=20,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                condition=models.Q(
+                    ("is_anomaly", True),
+                    ("status__in", ["pending", "under_investigation"]),
+                ),
+                fields=["-created_at"],
+                name="txn_high_risk_idx",
+            ),
+        ),
+    ]
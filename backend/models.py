@@ -14,7 +14,19 @@ class Merchant(models.Model):
         return self.name
 
 
+# Statuses that keep an anomaly in the high-risk review queue.
+OPEN_TRANSACTION_STATUSES = ['pending', 'under_investigation']
+
+
 class Transaction(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'Pending Review'),
+        ('allowed', 'Allowed'),
+        ('blocked', 'Blocked'),
+        ('under_investigation', 'Under Investigation'),
+    ]
+    OPEN_STATUSES = OPEN_TRANSACTION_STATUSES
+
     merchant = models.ForeignKey(Merchant, on_delete=models.CASCADE, related_name='transactions')
     amount = models.DecimalField(max_digits=10, decimal_places=2)
     timestamp = models.DateTimeField()
@@ -22,8 +34,20 @@ class Transaction(models.Model):
     risk_score = models.FloatField(default=0.0)
     is_anomaly = models.BooleanField(default=False)
     features = models.JSONField(default=dict)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Partial index holding only the open high-risk queue, already in
+            # newest-first order, so the listing reads k rows without a sort.
+            models.Index(
+                fields=['-created_at'],
+                condition=models.Q(is_anomaly=True, status__in=OPEN_TRANSACTION_STATUSES),
+                name='txn_high_risk_idx',
+            ),
+        ]
+
     def __str__(self):
         return f"Transaction {self.id} - {self.merchant.name} - ${self.amount}"
 
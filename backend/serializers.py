@@ -14,6 +14,8 @@ class TransactionSerializer(serializers.ModelSerializer):
     class Meta:
         model = Transaction
         fields = '__all__'
+        # Only agent actions move a transaction through the review queue
+        read_only_fields = ('status',)
 
 
 class AgentActionSerializer(serializers.ModelSerializer):
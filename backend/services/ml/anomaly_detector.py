@@ -30,3 +30,20 @@ class AnomalyDetector:
             
         return risk_score, is_anomaly
 
+    def score_transactions(self, transactions):
+        """Score many transactions at once; same rules as score_transaction"""
+        import numpy as np  # deferred so importing the detector stays cheap
+
+        amounts = np.fromiter(
+            (float(t.amount) if hasattr(t, 'amount') else 100.0 for t in transactions),
+            dtype=float,
+        )
+        return self.score_amounts(amounts)
+
+    def score_amounts(self, amounts):
+        """Vectorized amount rules: returns (risk_scores, is_anomaly) arrays"""
+        import numpy as np
+
+        amounts = np.asarray(amounts, dtype=float)
+        risk_scores = np.select([amounts > 1000, amounts > 500], [0.8, 0.6], default=0.2)
+        return risk_scores, amounts > 1000
@@ -0,0 +1,80 @@
+from django.test import TestCase
+from django.utils import timezone
+
+from .models import Merchant, Transaction
+from .views import ML_BATCH_MAX_SIZE
+
+
+class HighRiskTransactionsTests(TestCase):
+    def setUp(self):
+        merchant = Merchant.objects.create(name='Acme')
+        self.transactions = [
+            Transaction.objects.create(
+                merchant=merchant,
+                amount='1500.50',
+                timestamp=timezone.now(),
+                user_id='user_1',
+                is_anomaly=True,
+                risk_score=0.8,
+            )
+            for _ in range(105)
+        ]
+
+    def test_pages_through_the_open_queue(self):
+        first = self.client.get('/api/high-risk/').json()
+        self.assertEqual(first['count'], 105)
+        self.assertEqual(len(first['results']), 100)
+        self.assertIsNone(first['previous'])
+
+        second = self.client.get(first['next']).json()
+        self.assertEqual(len(second['results']), 5)
+        self.assertIsNone(second['next'])
+
+        # Pages neither overlap nor skip rows, and run newest first.
+        rows = first['results'] + second['results']
+        self.assertEqual(
+            sorted(row['id'] for row in rows),
+            sorted(txn.id for txn in self.transactions),
+        )
+        created = [row['created_at'] for row in rows]
+        self.assertEqual(created, sorted(created, reverse=True))
+        self.assertEqual(first['results'][0]['amount'], '1500.50')
+
+    def test_closed_transactions_leave_the_queue(self):
+        Transaction.objects.filter(
+            id__in=[txn.id for txn in self.transactions[:5]]
+        ).update(status='allowed')
+        response = self.client.get('/api/high-risk/?limit=10&offset=0').json()
+        self.assertEqual(response['count'], 100)
+        self.assertEqual(len(response['results']), 10)
+
+
+class MLScoreBatchTests(TestCase):
+    def post(self, transactions):
+        return self.client.post(
+            '/api/ml-score/batch/',
+            {'transactions': transactions},
+            content_type='application/json',
+        )
+
+    def test_scores_each_transaction_and_keeps_ids(self):
+        response = self.post([
+            {'id': 42, 'amount': 15000, 'hour': 3, 'is_foreign': True},
+            {'amount': 25.0, 'hour': 14},
+            {'id': 'abc', 'amount': 'not-a-number'},
+        ])
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual(
+            [result['transaction_id'] for result in results],
+            ['42', 'txn_1', 'abc'],
+        )
+        for result in results:
+            self.assertGreaterEqual(result['risk_score'], 0.0)
+            self.assertLessEqual(result['risk_score'], 1.0)
+            self.assertTrue(result['reasons'])
+        self.assertGreater(results[0]['risk_score'], results[1]['risk_score'])
+
+    def test_rejects_malformed_and_oversized_batches(self):
+        self.assertEqual(self.post('not-a-list').status_code, 400)
+        self.assertEqual(self.post([{}] * (ML_BATCH_MAX_SIZE + 1)).status_code, 400)
@@ -1,13 +1,36 @@
+from django.db.models import F
 from django.shortcuts import render
 from django.http import JsonResponse
 from rest_framework.decorators import api_view
+from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.response import Response
 from .models import Transaction, Merchant
 from .serializers import TransactionSerializer, MerchantSerializer
 from .services.ml.anomaly_detector import AnomalyDetector
 from .services.ml.explainability import ExplainabilityService
-from anomaly_detection.ml.scorer import SCORER
-from anomaly_detection.ml.bootstrap import bootstrap_fit
+
+# Shared per worker process; both services are stateless between calls.
+_DETECTOR = AnomalyDetector()
+_EXPLAINER = ExplainabilityService()
+
+
+class HighRiskPagination(LimitOffsetPagination):
+    """Pages the high-risk queue; ?limit= and ?offset= walk past the first page"""
+    default_limit = 100
+    max_limit = 500
+
+
+# Transaction columns in listing responses; matches TransactionSerializer.
+TRANSACTION_LIST_FIELDS = (
+    'id', 'merchant', 'amount', 'timestamp', 'user_id',
+    'risk_score', 'is_anomaly', 'features', 'status', 'created_at',
+)
+
+# Largest batch /api/ml-score/batch/ accepts in one request.
+ML_BATCH_MAX_SIZE = 5000
+
+# values() yields Decimal amounts; render them as TransactionSerializer does.
+_AMOUNT_FIELD = TransactionSerializer().fields['amount']
 
 # Homepage view
 def homepage(request):
@@ -20,16 +43,11 @@ def ingest_transaction(request):
     try:
         serializer = TransactionSerializer(data=request.data)
         if serializer.is_valid():
-            transaction = serializer.save()
-            
-            # Score the transaction
-            detector = AnomalyDetector()
-            risk_score, is_anomaly = detector.score_transaction(transaction)
-            
-            # Update transaction with risk score
-            transaction.risk_score = risk_score
-            transaction.is_anomaly = is_anomaly
-            transaction.save()
+            # Score the unsaved row so the result goes out in a single INSERT
+            risk_score, is_anomaly = _DETECTOR.score_transaction(
+                Transaction(**serializer.validated_data)
+            )
+            transaction = serializer.save(risk_score=risk_score, is_anomaly=is_anomaly)
             
             return Response({
                 'transaction_id': transaction.id,
@@ -45,7 +63,11 @@ def ingest_transaction(request):
 def score_transaction(request, transaction_id):
     """Get risk score for a specific transaction"""
     try:
-        transaction = Transaction.objects.get(id=transaction_id)
+        transaction = (
+            Transaction.objects.select_related('merchant')
+            .only('id', 'risk_score', 'is_anomaly', 'amount', 'merchant__name')
+            .get(id=transaction_id)
+        )
         return Response({
             'transaction_id': transaction.id,
             'risk_score': transaction.risk_score,
@@ -61,8 +83,7 @@ def explain_transaction(request, transaction_id):
     """Get explanation for a transaction's risk score"""
     try:
         transaction = Transaction.objects.get(id=transaction_id)
-        explainer = ExplainabilityService()
-        explanation = explainer.explain_transaction(transaction)
+        explanation = _EXPLAINER.explain_transaction(transaction)
         return Response(explanation)
     except Transaction.DoesNotExist:
         return Response({'error': 'Transaction not found'}, status=404)
@@ -112,49 +133,49 @@ def get_merchant(request, merchant_id):
 
 @api_view(['GET'])
 def get_high_risk_transactions(request):
-    """Get all high-risk transactions"""
+    """Get open high-risk transactions, newest first, one page at a time"""
     try:
         high_risk_transactions = Transaction.objects.filter(
             is_anomaly=True,
-            status__in=['pending', 'under_investigation']
-        ).order_by('-created_at')
+            status__in=Transaction.OPEN_STATUSES
+        ).order_by('-created_at').values(
+            *TRANSACTION_LIST_FIELDS, merchant_name=F('merchant__name')
+        )
         
-        serializer = TransactionSerializer(high_risk_transactions, many=True)
-        return Response(serializer.data)
+        # Plain dicts with the same keys TransactionSerializer emits, without
+        # building a model instance and serializer fields per row.
+        paginator = HighRiskPagination()
+        page = paginator.paginate_queryset(high_risk_transactions, request)
+        for row in page:
+            row['amount'] = _AMOUNT_FIELD.to_representation(row['amount'])
+        return paginator.get_paginated_response(page)
     except Exception as e:
         return Response({'error': str(e)}, status=500)
 
 @api_view(['POST'])
 def ml_score_transaction(request):
     """Score a transaction using the full ML model"""
+    # Imported on first use: sklearn and numba add most of a second to
+    # worker boot, and no other endpoint needs them.
+    from anomaly_detection.ml.scorer import SCORER
+
     try:
         # Bootstrap the model if not already fitted
-        if not SCORER._fitted:
-            bootstrap_fit(SCORER)
+        SCORER.ensure_fitted()
         
         # Extract transaction data from request
         transaction_data = request.data
         
-        # Prepare features for ML model
-        features = {
-            "amount": transaction_data.get('amount', 0.0),
-            "hour": transaction_data.get('hour', 12),
-            "is_foreign": 1.0 if transaction_data.get('is_foreign', False) else 0.0,
-            "merchant_risk": transaction_data.get('merchant_risk', 0.0),
-            "user_txn_rate": transaction_data.get('user_txn_rate', 0.0)
-        }
-        
         # Create transaction object for ML scoring
         txn = {
             "id": transaction_data.get('id', 'txn_001'),
-            "features": features
+            "features": _ml_features(transaction_data)
         }
         
         # Score the transaction
-        result = SCORER.score_batch([txn])
+        score_data = SCORER.score_one(txn)
         
-        if result:
-            score_data = result[0]
+        if score_data:
             return Response({
                 'transaction_id': score_data['id'],
                 'risk_score': score_data['score'],
@@ -165,4 +186,56 @@ def ml_score_transaction(request):
             return Response({'error': 'Failed to score transaction'}, status=500)
             
     except Exception as e:
-        return Response({'error': str(e)}, status=500)
\ No newline at end of file
+        return Response({'error': str(e)}, status=500)
+
+@api_view(['POST'])
+def ml_score_batch(request):
+    """Score a list of transactions with the full ML model in one pass"""
+    from anomaly_detection.ml.scorer import SCORER
+
+    try:
+        payload = request.data if isinstance(request.data, dict) else {}
+        transactions = payload.get('transactions')
+        if not isinstance(transactions, list):
+            return Response({'error': "'transactions' must be a list"}, status=400)
+        if len(transactions) > ML_BATCH_MAX_SIZE:
+            return Response(
+                {'error': f"'transactions' may hold at most {ML_BATCH_MAX_SIZE} items"},
+                status=400
+            )
+        
+        SCORER.ensure_fitted()
+        
+        # Missing ids fall back to txn_<index> inside the scorer
+        txns = [
+            {
+                "id": item.get('id') if isinstance(item, dict) else None,
+                "features": _ml_features(item if isinstance(item, dict) else {})
+            }
+            for item in transactions
+        ]
+        results = SCORER.score_batch(txns)
+        
+        return Response({
+            'results': [
+                {
+                    'transaction_id': score_data['id'],
+                    'risk_score': score_data['score'],
+                    'reasons': score_data['reasons']
+                }
+                for score_data in results
+            ],
+            'status': 'success'
+        })
+    except Exception as e:
+        return Response({'error': str(e)}, status=500)
+
+def _ml_features(transaction_data):
+    """Map a request payload onto the ML model's feature dict"""
+    return {
+        "amount": transaction_data.get('amount', 0.0),
+        "hour": transaction_data.get('hour', 12),
+        "is_foreign": 1.0 if transaction_data.get('is_foreign', False) else 0.0,
+        "merchant_risk": transaction_data.get('merchant_risk', 0.0),
+        "user_txn_rate": transaction_data.get('user_txn_rate', 0.0)
+    }